@@ -4,14 +4,17 @@ Demonstrates the complete workflow with a test query
 """
 
 import asyncio
+import io
 import os
-import json
-from datetime import datetime
-from typing import Optional
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Optional, List, Dict, Tuple
+import orjson
 from dotenv import load_dotenv
 
 from src.state import create_initial_state
-from src.graph import genesis_pipeline
+from src.graph import get_genesis_pipeline
 from src.logger_config import logger
 from src.database import (
     init_database,
@@ -29,13 +32,25 @@ load_dotenv()
 init_database()
 
 
-async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None):
+async def run_genesis_pipeline(
+    user_idea: str,
+    project_id: Optional[int] = None,
+    on_project_started: Optional[Callable[[int], None]] = None,
+    write_files: bool = True
+):
     """
     Execute the Genesis Pipeline with a user idea
     
+    Database helpers are synchronous, so they are run in a worker thread
+    to keep the event loop free while waiting on the database.
+    
     Args:
         user_idea: Raw user input describing their project
         project_id: Optional existing project ID (if None, creates new project)
+        on_project_started: Optional callback invoked with the project ID once
+            the project is marked as running
+        write_files: Write the outputs to disk; if False they are only
+            stored in the database
         
     Returns:
         Tuple of (final_state, project_id)
@@ -48,17 +63,17 @@ async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None)
     try:
         # Create or get project record
         if project_id is None:
-            project = create_project(user_idea, db)
+            project = await asyncio.to_thread(create_project, user_idea, db)
             project_id = project.id
             logger.info(f"Created new project with ID: {project_id}")
         else:
-            project = get_project(project_id, db)
+            project = await asyncio.to_thread(get_project, project_id, db)
             if not project:
                 raise ValueError(f"Project with ID {project_id} not found")
             # Update existing project
             project.user_idea = user_idea
             project.status = ProjectStatus.PENDING
-            db.commit()
+            await asyncio.to_thread(db.commit)
             logger.info(f"Using existing project ID: {project_id}")
         
         logger.info("=" * 80)
@@ -68,28 +83,32 @@ async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None)
         logger.info(f"Project ID: {project_id}")
         
         # Update status to running
-        update_project_status(project_id, ProjectStatus.RUNNING, db)
+        await asyncio.to_thread(update_project_status, project_id, ProjectStatus.RUNNING, db)
+        if on_project_started is not None:
+            on_project_started(project_id)
         
         # Create initial state
         initial_state = create_initial_state(user_idea)
-        initial_state["execution_metadata"]["start_time"] = datetime.utcnow().isoformat()
+        start_ns = time.monotonic_ns()
+        initial_state["execution_metadata"]["start_time_ns"] = time.time_ns()
         initial_state["execution_metadata"]["project_id"] = project_id
         
         # Execute the pipeline
         logger.info("Starting agent orchestration...")
-        final_state = await genesis_pipeline.ainvoke(initial_state)
+        final_state = await get_genesis_pipeline().ainvoke(initial_state)
         
-        final_state["execution_metadata"]["end_time"] = datetime.utcnow().isoformat()
+        duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+        final_state["execution_metadata"]["duration_ms"] = duration_ms
         
-        # Save outputs to files
+        # Save outputs to files (or keep them for the database only)
         output_dir = f"output/project_{project_id}"
-        artifacts_dict = save_output(final_state, output_dir)
-        
-        # Save artifact paths to database
-        save_project_artifacts(project_id, artifacts_dict, output_dir, db)
+        artifacts_dict, contents_dict = await save_output(final_state, output_dir, write_files)
         
-        # Update project status to completed
-        update_project_status(project_id, ProjectStatus.COMPLETED, db)
+        # Mark project completed and save artifacts in a single transaction
+        await asyncio.to_thread(update_project_status, project_id, ProjectStatus.COMPLETED, db, False)
+        await asyncio.to_thread(
+            save_project_artifacts, project_id, artifacts_dict, output_dir, db, contents_dict
+        )
         
         logger.info("=" * 80)
         logger.info("GENESIS PIPELINE COMPLETED")
@@ -100,7 +119,7 @@ async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None)
             'agent': 'pipeline_summary',
             'status': 'complete',
             'files_generated': len(final_state.get('source_code', {})),
-            'execution_time': 'calculated',
+            'execution_time': duration_ms / 1000,
             'project_id': project_id
         })
         
@@ -110,7 +129,9 @@ async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None)
         # Update project status to failed
         if project_id:
             try:
-                update_project_status(project_id, ProjectStatus.FAILED, db)
+                # Discard any half-finished transaction before recording the failure
+                await asyncio.to_thread(db.rollback)
+                await asyncio.to_thread(update_project_status, project_id, ProjectStatus.FAILED, db)
             except:
                 pass  # Don't fail if status update fails
         
@@ -121,68 +142,107 @@ async def run_genesis_pipeline(user_idea: str, project_id: Optional[int] = None)
         })
         raise
     finally:
-        db.close()
+        await asyncio.to_thread(db.close)
+
+
+def _write_bytes_once(path: str, chunks: List[bytes]) -> None:
+    """
+    Write a list of byte chunks to a file with a single syscall where possible
+    
+    Args:
+        path: Destination file path
+        chunks: Byte buffers written in order
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        written = 0
+        if hasattr(os, "writev"):
+            written = os.writev(fd, [memoryview(chunk) for chunk in chunks])
+        if written == sum(len(chunk) for chunk in chunks):
+            return
+        # Windows has no writev; also finish any short write
+        remaining = memoryview(b"".join(chunks))[written:]
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
 
 
-def save_output(final_state: dict, output_dir: str = "output") -> dict:
+def _write_source_archive(target, source_code: Dict[str, str]) -> None:
+    """Pack all generated source files into one zip archive at a path or file object (executed in a worker thread)"""
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for filename, code in source_code.items():
+            zf.writestr(filename, code.encode("utf-8"))
+
+
+async def save_output(
+    final_state: dict,
+    output_dir: str = "output",
+    write_files: bool = True
+) -> Tuple[dict, dict]:
     """
-    Save all pipeline outputs to files
+    Save all pipeline outputs to files, or serialize them for the database
+    
+    Each output lives in one store: written to disk, or returned as content
+    to be stored (compressed) in the database. Writes are dispatched to
+    worker threads so the event loop is not blocked and independent files
+    are written concurrently.
     
     Args:
         final_state: The completed state from the pipeline
         output_dir: Directory to save outputs
+        write_files: Write the outputs to disk; if False nothing is written
+            and the serialized outputs are returned instead
         
     Returns:
-        Dictionary mapping artifact types to file paths
+        Tuple of (artifact type -> file path, artifact type -> content bytes).
+        The content mapping is empty when the files were written.
     """
-    os.makedirs(output_dir, exist_ok=True)
+    out = Path(output_dir)
     
     artifacts = {}
+    contents = {}
+    
+    # Serialize the document artifacts once
+    contents["prd"] = final_state["prd_content"].encode("utf-8")
+    artifacts["prd"] = str(out / "PRD.md")
+    
+    contents["brand_assets"] = orjson.dumps(final_state["brand_assets"], option=orjson.OPT_INDENT_2)
+    artifacts["brand_assets"] = str(out / "brand_guide.json")
     
-    # Save PRD
-    prd_path = f"{output_dir}/PRD.md"
-    with open(prd_path, "w", encoding="utf-8") as f:
-        f.write(final_state["prd_content"])
-    artifacts["prd"] = prd_path
-    
-    # Save brand assets
-    brand_path = f"{output_dir}/brand_guide.json"
-    with open(brand_path, "w", encoding="utf-8") as f:
-        json.dump(final_state["brand_assets"], f, indent=2)
-    artifacts["brand_assets"] = brand_path
-    
-    # Save architecture
-    arch_path = f"{output_dir}/architecture.json"
-    with open(arch_path, "w", encoding="utf-8") as f:
-        json.dump(final_state["architecture_map"], f, indent=2)
-    artifacts["architecture"] = arch_path
-    
-    # Save source code files
-    code_dir = f"{output_dir}/source_code"
-    os.makedirs(code_dir, exist_ok=True)
-    for filename, code in final_state["source_code"].items():
-        # Create subdirectories if needed
-        filepath = os.path.join(code_dir, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(code)
-    artifacts["source_code"] = code_dir
-    
-    # Save marketing plan
-    marketing_path = f"{output_dir}/marketing_plan.md"
-    with open(marketing_path, "w", encoding="utf-8") as f:
-        f.write(final_state["marketing_plan"])
-    artifacts["marketing_plan"] = marketing_path
+    contents["architecture"] = orjson.dumps(final_state["architecture_map"], option=orjson.OPT_INDENT_2)
+    artifacts["architecture"] = str(out / "architecture.json")
+    
+    contents["marketing_plan"] = final_state["marketing_plan"].encode("utf-8")
+    artifacts["marketing_plan"] = str(out / "marketing_plan.md")
     
     # Save install guide if it exists
     if "install_guide" in final_state:
-        install_path = f"{output_dir}/INSTALL_GUIDE.md"
-        with open(install_path, "w", encoding="utf-8") as f:
-            f.write(final_state["install_guide"])
-        artifacts["install_guide"] = install_path
+        contents["install_guide"] = final_state["install_guide"].encode("utf-8")
+        artifacts["install_guide"] = str(out / "INSTALL_GUIDE.md")
+    
+    # Source code files are packed into a single archive
+    code_path = str(out / "source_code.zip")
+    artifacts["source_code"] = code_path
+    
+    if not write_files:
+        archive = io.BytesIO()
+        await asyncio.to_thread(_write_source_archive, archive, final_state["source_code"])
+        contents["source_code"] = archive.getvalue()
+        return artifacts, contents
+    
+    out.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        asyncio.to_thread(_write_bytes_once, artifacts[artifact_type], [payload])
+        for artifact_type, payload in contents.items()
+    ]
+    tasks.append(asyncio.to_thread(_write_source_archive, code_path, final_state["source_code"]))
+    
+    # Wait for all writes to finish
+    await asyncio.gather(*tasks)
     
     logger.info(f"All outputs saved to {output_dir}/")
-    return artifacts
+    return artifacts, {}
 
 
 async def main():
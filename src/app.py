@@ -5,15 +5,24 @@ Web-based interface for running and monitoring pipeline executions
 
 import streamlit as st
 import asyncio
+import codecs
+import io
+import itertools
 import os
-import json
+import threading
+import time
+import zipfile
+import zlib
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
+import orjson
 from dotenv import load_dotenv
 
 from src.database import (
     init_database,
     get_all_projects,
+    get_compressed_artifact_content,
     get_project,
     ProjectStatus
 )
@@ -26,6 +35,9 @@ load_dotenv()
 # Initialize database
 init_database()
 
+# Markdown larger than this is streamed to the page in chunks of this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
 # Page configuration
 st.set_page_config(
     page_title="Genesis Pipeline",
@@ -35,7 +47,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CSS_BLOCK = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -62,7 +74,17 @@ st.markdown("""
         background-color: #f8f9fa;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def inject_css():
+    """
+    Inject the custom CSS
+    
+    Streamlit rebuilds the page on every rerun, so the style block has to be
+    emitted each time; caching it would drop the styles after the first run.
+    """
+    st.markdown(CSS_BLOCK, unsafe_allow_html=True)
 
 
 def get_status_badge(status: ProjectStatus) -> str:
@@ -78,11 +100,122 @@ def format_timestamp(timestamp: datetime) -> str:
     return "N/A"
 
 
-@st.cache_data(ttl=5)
-def load_projects(limit: int = 50):
-    """Load projects from database (cached for 5 seconds)"""
+def iter_artifact_text(file_path: str, chunk_size: int = STREAM_CHUNK_BYTES):
+    """
+    Yield a text artifact in chunks for progressive rendering
+    
+    An incremental decoder keeps multi-byte characters that straddle a
+    chunk boundary intact.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def render_markdown_file(file_path: str):
+    """Render a markdown artifact from disk, streaming large files"""
+    if os.path.getsize(file_path) <= STREAM_CHUNK_BYTES:
+        st.markdown(Path(file_path).read_text(encoding='utf-8'))
+    else:
+        st.write_stream(iter_artifact_text(file_path))
+
+
+def render_source_archive(archive):
+    """Render every file of a source code archive (path or file object)"""
+    with zipfile.ZipFile(archive) as zf:
+        for name in zf.namelist():
+            st.markdown(f"**{name}**")
+            st.code(zf.read(name).decode('utf-8', errors='replace'))
+
+
+def iter_compressed_text(content: bytes, chunk_size: int = STREAM_CHUNK_BYTES):
+    """
+    Yield zlib-compressed text in chunks of at most `chunk_size` bytes of output
+    
+    The input is fed to the decompressor in slices, so the whole body is
+    never decompressed at once. Empty chunks are skipped, so content that
+    fits in a single chunk yields exactly one string.
+    """
+    decompressor = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        pending = view[start:start + chunk_size]
+        while pending:
+            text = decoder.decode(decompressor.decompress(pending, chunk_size))
+            pending = decompressor.unconsumed_tail
+            if text:
+                yield text
+    text = decoder.decode(decompressor.flush(), final=True)
+    if text:
+        yield text
+
+
+def render_compressed_markdown(content: bytes):
+    """Render markdown stored compressed in the database, streaming large documents"""
+    chunks = iter_compressed_text(content)
+    first = next(chunks, '')
+    second = next(chunks, None)
+    if second is None:
+        st.markdown(first)
+    else:
+        st.write_stream(itertools.chain((first, second), chunks))
+
+
+def render_artifact_content(file_path: str, content: bytes):
+    """Render an artifact stored (compressed) in the database, using its file extension as the format"""
+    if file_path.endswith('.md'):
+        render_compressed_markdown(content)
+    elif file_path.endswith('.json'):
+        st.json(orjson.loads(zlib.decompress(content)))
+    elif file_path.endswith('.zip'):
+        render_source_archive(io.BytesIO(zlib.decompress(content)))
+
+
+def load_artifact_content(artifact_id: int) -> Optional[bytes]:
+    """Load an artifact's stored content, still compressed (None if unavailable)"""
+    try:
+        return get_compressed_artifact_content(artifact_id)
+    except Exception as e:
+        logger.error(f"Error loading artifact content: {str(e)}")
+        return None
+
+
+class ProjectsVersion:
+    """Process-wide counter of changes to the project list"""
+    
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def value(self) -> int:
+        return self._value
+    
+    def bump(self):
+        with self._lock:
+            self._value += 1
+
+
+@st.cache_resource
+def get_projects_version() -> ProjectsVersion:
+    """Get the project list version shared by all sessions"""
+    return ProjectsVersion()
+
+
+# One entry per status filter is current at a time; older versions age out
+@st.cache_data(max_entries=16)
+def load_projects(limit: int = 50, status: Optional[ProjectStatus] = None, version: int = 0):
+    """
+    Load projects from database, optionally filtered by status
+    
+    Cached until `version` changes; pipeline runs bump the shared
+    get_projects_version() counter when they create or update a project.
+    """
     try:
-        return get_all_projects(limit=limit)
+        return get_all_projects(limit=limit, status=status)
     except Exception as e:
         logger.error(f"Error loading projects: {str(e)}")
         return []
@@ -92,28 +225,31 @@ def display_project_history():
     """Display project history in sidebar"""
     st.sidebar.header("📚 Project History")
     
-    projects = load_projects(limit=50)
-    
-    if not projects:
-        st.sidebar.info("No projects yet. Launch your first pipeline!")
-        return None
-    
     # Filter options
     filter_status = st.sidebar.selectbox(
         "Filter by Status",
         ["All", "Completed", "Running", "Failed", "Pending"],
         key="status_filter"
     )
+    status_map = {
+        "Completed": ProjectStatus.COMPLETED,
+        "Running": ProjectStatus.RUNNING,
+        "Failed": ProjectStatus.FAILED,
+        "Pending": ProjectStatus.PENDING
+    }
     
-    # Filter projects
-    if filter_status != "All":
-        status_map = {
-            "Completed": ProjectStatus.COMPLETED,
-            "Running": ProjectStatus.RUNNING,
-            "Failed": ProjectStatus.FAILED,
-            "Pending": ProjectStatus.PENDING
-        }
-        projects = [p for p in projects if p.status == status_map[filter_status]]
+    projects = load_projects(
+        limit=50,
+        status=status_map.get(filter_status),
+        version=get_projects_version().value
+    )
+    
+    if not projects:
+        if filter_status == "All":
+            st.sidebar.info("No projects yet. Launch your first pipeline!")
+        else:
+            st.sidebar.info(f"No {filter_status.lower()} projects.")
+        return None
     
     # Display projects
     selected_project_id = None
@@ -134,58 +270,39 @@ def display_project_details(project_id: int):
     """Display detailed view of a project"""
     from src.database import get_db
     
-    # Get project and artifacts within a session context
+    # Artifacts are eagerly loaded, so the project stays usable after close
     db = get_db()
     try:
-        project = get_project(project_id, db)
-        
-        if not project:
-            st.error(f"Project {project_id} not found")
-            return
-        
-        # Access artifacts while session is still open and extract data
-        artifacts_list = []
-        if project.artifacts:
-            for artifact in project.artifacts:
-                # Extract all data we need from artifacts before closing session
-                artifacts_list.append({
-                    'artifact_type': artifact.artifact_type,
-                    'file_path': artifact.file_path,
-                    'created_at': artifact.created_at
-                })
-        
-        # Store project data we need (since we'll close the session)
-        project_data = {
-            'id': project.id,
-            'status': project.status,
-            'created_at': project.created_at,
-            'updated_at': project.updated_at,
-            'user_idea': project.user_idea
-        }
+        project = get_project(project_id, db, eager=True)
     finally:
         db.close()
     
-    # Now display using the stored data and artifacts
-    st.header(f"Project #{project_data['id']}")
+    if not project:
+        st.error(f"Project {project_id} not found")
+        return
+    
+    st.header(f"Project #{project.id}")
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Status", project_data['status'].value.upper())
+        st.metric("Status", project.status.value.upper())
     with col2:
-        st.metric("Created", format_timestamp(project_data['created_at']))
+        st.metric("Created", format_timestamp(project.created_at))
     with col3:
-        st.metric("Updated", format_timestamp(project_data['updated_at']))
+        st.metric("Updated", format_timestamp(project.updated_at))
     
     st.subheader("User Idea")
-    st.write(project_data['user_idea'])
+    st.write(project.user_idea)
     
-    # Display artifacts (already loaded as a list)
+    # Display artifacts
+    artifacts_list = project.artifacts
     
     if artifacts_list:
         st.subheader("Generated Artifacts")
+        # Stored content is served from the database; CLI runs and older artifacts are read from disk
         artifact_types = {}
         for artifact in artifacts_list:
-            artifact_type = artifact['artifact_type']
+            artifact_type = artifact.artifact_type
             if artifact_type not in artifact_types:
                 artifact_types[artifact_type] = []
             artifact_types[artifact_type].append(artifact)
@@ -193,16 +310,23 @@ def display_project_details(project_id: int):
         for artifact_type, artifacts in artifact_types.items():
             with st.expander(f"{artifact_type.replace('_', ' ').title()} ({len(artifacts)})"):
                 for artifact in artifacts:
-                    file_path = artifact['file_path']
+                    file_path = artifact.file_path
                     st.write(f"📄 {file_path}")
-                    if os.path.exists(file_path):
+                    # Fetched per artifact, so only one compressed body is held at a time
+                    content = load_artifact_content(artifact.id)
+                    if content is not None:
+                        try:
+                            render_artifact_content(file_path, content)
+                        except Exception as e:
+                            st.error(f"Error reading artifact: {str(e)}")
+                    elif os.path.exists(file_path):
                         try:
                             if file_path.endswith('.md'):
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    st.markdown(f.read())
+                                render_markdown_file(file_path)
                             elif file_path.endswith('.json'):
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    st.json(json.load(f))
+                                st.json(orjson.loads(Path(file_path).read_bytes()))
+                            elif file_path.endswith('.zip'):
+                                render_source_archive(file_path)
                         except Exception as e:
                             st.error(f"Error reading file: {str(e)}")
                     else:
@@ -211,21 +335,60 @@ def display_project_details(project_id: int):
         st.info("No artifacts generated yet. Artifacts will appear here once the pipeline completes.")
 
 
-def run_pipeline_async(user_idea: str):
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the long-lived event loop that runs pipelines
+    
+    The loop runs forever in a daemon thread and is shared by all sessions,
+    so HTTP connection pools held by the LLM client survive across runs.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="pipeline-loop", daemon=True).start()
+    return loop
+
+
+async def run_pipeline_async(user_idea: str, projects_version: ProjectsVersion):
     """Run pipeline in async context"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        final_state, project_id = loop.run_until_complete(run_genesis_pipeline(user_idea))
-        loop.close()
+        # Show the new running project in the history as soon as it exists
+        # Outputs are kept in the database only; nothing is written to disk
+        final_state, project_id = await run_genesis_pipeline(
+            user_idea, on_project_started=lambda _: projects_version.bump(), write_files=False
+        )
         return project_id, None
     except Exception as e:
         return None, str(e)
+    finally:
+        # Project list changed (new row, status update) either way
+        projects_version.bump()
+
+
+def check_pipeline_future():
+    """Collect the result of a background pipeline run once it has finished"""
+    future = st.session_state.get("pipeline_future")
+    if future is None or not future.done():
+        return
+    
+    st.session_state.pipeline_future = None
+    st.session_state.pipeline_running = False
+    
+    project_id, error = future.result()
+    if error:
+        st.error(f"❌ Pipeline failed: {error}")
+    elif project_id:
+        st.success(f"✅ Pipeline completed! Project ID: {project_id}")
+        st.session_state.selected_project_id = project_id
 
 
 def main():
     """Main Streamlit application"""
     
+    inject_css()
+    
+    # Pick up results from a pipeline that finished since the last rerun
+    check_pipeline_future()
+    
     # Header
     st.markdown('<h1 class="main-header">🚀 Genesis Pipeline</h1>', unsafe_allow_html=True)
     st.markdown("---")
@@ -249,7 +412,12 @@ def main():
         
         col1, col2 = st.columns([1, 4])
         with col1:
-            launch_button = st.button("🚀 Launch Pipeline", type="primary", use_container_width=True)
+            launch_button = st.button(
+                "🚀 Launch Pipeline",
+                type="primary",
+                use_container_width=True,
+                disabled=bool(st.session_state.get("pipeline_running"))
+            )
         
         # Check if pipeline is already running
         if 'pipeline_running' in st.session_state and st.session_state.pipeline_running:
@@ -263,20 +431,12 @@ def main():
             elif not os.getenv("OPENAI_API_KEY"):
                 st.error("❌ OPENAI_API_KEY not found in environment variables. Please configure it in your .env file.")
             else:
-                with st.spinner("🚀 Launching Genesis Pipeline..."):
-                    st.session_state.pipeline_running = True
-                    
-                    # Run pipeline
-                    project_id, error = run_pipeline_async(user_idea.strip())
-                    
-                    if error:
-                        st.error(f"❌ Pipeline failed: {error}")
-                        st.session_state.pipeline_running = False
-                    elif project_id:
-                        st.success(f"✅ Pipeline completed! Project ID: {project_id}")
-                        st.session_state.pipeline_running = False
-                        st.session_state.selected_project_id = project_id
-                        st.rerun()
+                # Run pipeline in the background so the UI stays responsive
+                st.session_state.pipeline_running = True
+                st.session_state.pipeline_future = asyncio.run_coroutine_threadsafe(
+                    run_pipeline_async(user_idea.strip(), get_projects_version()), get_event_loop()
+                )
+                st.rerun()
         
         # Instructions
         with st.expander("ℹ️ How it works"):
@@ -297,8 +457,10 @@ def main():
         if 'pipeline_running' in st.session_state and st.session_state.pipeline_running:
             st.info("💡 Tip: Check the Project History sidebar to see your project's progress in real-time!")
     
-    # Auto-refresh for running projects
-    if 'pipeline_running' in st.session_state and st.session_state.pipeline_running:
+    # Poll the background run without blocking the rest of the page
+    future = st.session_state.get("pipeline_future")
+    if future is not None and not future.done():
+        time.sleep(1)
         st.rerun()
 
 
@@ -3,12 +3,19 @@ Database Models and Utilities for Genesis Pipeline
 Handles persistence of projects and artifacts
 """
 
+import functools
 import os
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from typing import Optional, List, Dict, Iterator
+from sqlalchemy import create_engine, bindparam, insert, inspect, select, text, update, Column, Integer, String, Text, DateTime, ForeignKey, Index, LargeBinary, Enum as SQLEnum
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship, joinedload, selectinload
+from sqlalchemy.orm import sessionmaker, Session, relationship, deferred, joinedload, raiseload, selectinload
+from sqlalchemy.pool import QueuePool
 from enum import Enum
 
 Base = declarative_base()
@@ -28,37 +35,82 @@ class Project(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_idea = Column(Text, nullable=False)
-    status = Column(SQLEnum(ProjectStatus), default=ProjectStatus.PENDING, nullable=False)
+    # Stored as VARCHAR + CHECK constraint (not a native ENUM) holding the enum values
+    status = Column(
+        SQLEnum(
+            ProjectStatus,
+            name="ck_projects_status",
+            native_enum=False,
+            create_constraint=True,
+            length=16,
+            values_callable=lambda statuses: [status.value for status in statuses]
+        ),
+        default=ProjectStatus.PENDING,
+        nullable=False
+    )
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    # Serve "newest first" listings, optionally filtered by status, without a sort
+    __table_args__ = (
+        Index("ix_projects_created_at", created_at.desc()),
+        Index("ix_projects_status_created_at", "status", "created_at"),
+    )
+    
     # Relationship to artifacts
     artifacts = relationship("Artifact", back_populates="project", cascade="all, delete-orphan")
 
 
 class Artifact(Base):
-    """Artifact model - stores file paths to generated outputs"""
+    """Artifact model - stores generated outputs (file path and compressed content)"""
     __tablename__ = "artifacts"
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     artifact_type = Column(String(50), nullable=False)  # 'prd', 'brand_assets', 'architecture', 'source_code', 'marketing_plan', 'install_guide'
     file_path = Column(String(500), nullable=False)
+    content = deferred(Column(LargeBinary, nullable=True))  # zlib-compressed artifact body
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        Index("ix_artifacts_project_type", "project_id", "artifact_type"),
+    )
+    
     # Relationship to project
     project = relationship("Project", back_populates="artifacts")
 
 
+# Prebuilt statements for hot lookups; only the bound ID changes per call,
+# so SQLAlchemy compiles each one once and reuses it from its statement cache.
+# Relationships that are not explicitly loaded raise instead of lazy loading.
+_SELECT_PROJECT = (
+    select(Project)
+    .options(raiseload("*"))
+    .where(Project.id == bindparam("project_id"))
+)
+_SELECT_PROJECT_WITH_ARTIFACTS = (
+    select(Project)
+    # Single parent row, so joinedload fetches project and artifacts in one round trip
+    .options(joinedload(Project.artifacts), raiseload("*"))
+    .where(Project.id == bindparam("project_id"))
+)
+_SELECT_ARTIFACT_CONTENT = select(Artifact.content).where(Artifact.id == bindparam("artifact_id"))
+
+
 # Database connection management
 _engine = None
 _SessionLocal = None
+_init_lock = threading.Lock()
 
 
+@functools.lru_cache(maxsize=1)
 def get_database_url() -> str:
     """
     Get database URL from environment variable or use default
     
+    Read on first call rather than at import, so a .env loaded by the
+    entry point after importing this module is still picked up.
+    
     Returns:
         Database connection string
     """
@@ -71,32 +123,138 @@ def get_database_url() -> str:
 def init_database():
     """
     Initialize database connection and create tables
+    
+    The engine keeps a pool of warm connections that every session reuses.
+    Pool sizing can be tuned with DB_POOL_SIZE and DB_MAX_OVERFLOW.
+    
+    Safe to call repeatedly (the Streamlit app calls it on every rerun):
+    the engine is built and the schema set up once per process.
     """
     global _engine, _SessionLocal
     
-    database_url = get_database_url()
-    _engine = create_engine(database_url, pool_pre_ping=True)
-    _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    with _init_lock:
+        if _engine is not None:
+            return
+        
+        database_url = get_database_url()
+        url = make_url(database_url)
+        pool_options = {}
+        # Sizing only applies to QueuePool; in-memory SQLite uses SingletonThreadPool
+        if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+            pool_options["pool_size"] = int(os.getenv("DB_POOL_SIZE", "20"))
+            pool_options["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        
+        engine = create_engine(
+            url,
+            **pool_options,
+            pool_recycle=1800,
+            pool_pre_ping=True,
+            insertmanyvalues_page_size=1000
+        )
+        
+        # Create all tables
+        Base.metadata.create_all(bind=engine)
+        _migrate_schema(engine)
+        
+        # Objects returned by the helpers stay populated after commit (no refresh SELECT)
+        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+        # Published only once the schema is ready, so a failed setup is retried
+        _engine = engine
+
+
+def _migrate_schema(engine):
+    """
+    Bring databases created by an older version up to the current schema
+    
+    create_all() only creates missing tables, so new columns, indexes and
+    column type changes on existing tables are applied here. Each step
+    checks first, so on an up-to-date schema this only reads.
+    
+    Args:
+        engine: Engine connected to the database to migrate
+    """
+    inspector = inspect(engine)
     
-    # Create all tables
-    Base.metadata.create_all(bind=_engine)
+    with engine.begin() as conn:
+        artifact_columns = {column["name"] for column in inspector.get_columns("artifacts")}
+        if "content" not in artifact_columns:
+            column_type = LargeBinary().compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE artifacts ADD COLUMN content {column_type}"))
+        
+        # projects.status used to be a native ENUM storing member names (e.g. 'PENDING')
+        status_column = next(c for c in inspector.get_columns("projects") if c["name"] == "status")
+        if engine.dialect.name == "postgresql" and getattr(status_column["type"], "native_enum", False):
+            conn.execute(text(
+                "ALTER TABLE projects ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text)"
+            ))
+            conn.execute(text("DROP TYPE IF EXISTS projectstatus"))
+            conn.execute(text(
+                "ALTER TABLE projects ADD CONSTRAINT ck_projects_status "
+                "CHECK (status IN ('pending', 'running', 'completed', 'failed'))"
+            ))
+        elif conn.execute(text(
+            "SELECT 1 FROM projects "
+            "WHERE status IN ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED') LIMIT 1"
+        )).first() is not None:
+            conn.execute(text(
+                "UPDATE projects SET status = lower(status) "
+                "WHERE status IN ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED')"
+            ))
+    
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=engine)
+            except DBAPIError:
+                # Another process starting up may have created it first
+                if index.name not in {i["name"] for i in inspect(engine).get_indexes(table.name)}:
+                    raise
 
 
 def get_db() -> Session:
     """
-    Get database session (dependency injection pattern)
+    Get a new database session (dependency injection pattern)
     
     Returns:
-        Database session
+        Database session, to be closed by the caller
     """
     if _SessionLocal is None:
         init_database()
     
-    db = _SessionLocal()
+    return _SessionLocal()
+
+
+@contextmanager
+def session_scope(db: Optional[Session] = None) -> Iterator[Session]:
+    """
+    Provide a session for a unit of work
+    
+    A session passed in is yielded as-is and left to its owner. Otherwise a
+    new session is opened, committed on success, rolled back on error and
+    closed on exit.
+    
+    Args:
+        db: Optional database session
+        
+    Yields:
+        Database session
+    """
+    if db is not None:
+        yield db
+        return
+    
+    session = get_db()
     try:
-        return db
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
     finally:
-        pass  # Session will be closed by caller
+        session.close()
 
 
 def create_project(user_idea: str, db: Optional[Session] = None) -> Project:
@@ -110,29 +268,21 @@ def create_project(user_idea: str, db: Optional[Session] = None) -> Project:
     Returns:
         Created Project instance
     """
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
-        project = Project(
-            user_idea=user_idea,
-            status=ProjectStatus.PENDING
-        )
-        db.add(project)
+    with session_scope(db) as db:
+        # INSERT ... RETURNING populates id and defaults without a follow-up SELECT
+        project = db.scalars(
+            insert(Project).returning(Project),
+            [{"user_idea": user_idea, "status": ProjectStatus.PENDING}]
+        ).one()
         db.commit()
-        db.refresh(project)
         return project
-    finally:
-        if should_close:
-            db.close()
 
 
 def update_project_status(
     project_id: int,
     status: ProjectStatus,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    commit: bool = True
 ) -> Project:
     """
     Update project status
@@ -141,35 +291,33 @@ def update_project_status(
         project_id: Project ID
         status: New status
         db: Optional database session
+        commit: If False, leave the change in the caller's open transaction
         
     Returns:
         Updated Project instance
     """
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+    with session_scope(db) as db:
+        # UPDATE ... RETURNING replaces the select-modify-refresh round trips
+        project = db.scalars(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(status=status, updated_at=datetime.utcnow())
+            .returning(Project)
+        ).one_or_none()
         if not project:
             raise ValueError(f"Project with id {project_id} not found")
         
-        project.status = status
-        project.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(project)
+        if commit:
+            db.commit()
         return project
-    finally:
-        if should_close:
-            db.close()
 
 
 def add_artifact(
     project_id: int,
     artifact_type: str,
     file_path: str,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    commit: bool = True
 ) -> Artifact:
     """
     Add an artifact (file path) to a project
@@ -179,64 +327,47 @@ def add_artifact(
         artifact_type: Type of artifact ('prd', 'brand_assets', etc.)
         file_path: Path to the artifact file
         db: Optional database session
+        commit: If False, leave the insert in the caller's open transaction
         
     Returns:
         Created Artifact instance
     """
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
-        artifact = Artifact(
-            project_id=project_id,
-            artifact_type=artifact_type,
-            file_path=file_path
-        )
-        db.add(artifact)
-        db.commit()
-        db.refresh(artifact)
+    with session_scope(db) as db:
+        artifact = db.scalars(
+            insert(Artifact).returning(Artifact),
+            [{"project_id": project_id, "artifact_type": artifact_type, "file_path": file_path}]
+        ).one()
+        if commit:
+            db.commit()
         return artifact
-    finally:
-        if should_close:
-            db.close()
 
 
-def get_project(project_id: int, db: Optional[Session] = None) -> Optional[Project]:
+def get_project(
+    project_id: int,
+    db: Optional[Session] = None,
+    eager: bool = False
+) -> Optional[Project]:
     """
-    Get a project by ID with its artifacts (eagerly loaded)
+    Get a project by ID
     
     Args:
         project_id: Project ID
         db: Optional database session
+        eager: Load the project's artifacts in the same call
         
     Returns:
         Project instance or None if not found
     """
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
-        # Use selectinload for one-to-many relationships (more reliable than joinedload)
-        project = db.query(Project).options(selectinload(Project.artifacts)).filter(Project.id == project_id).first()
-        
-        if project:
-            # Force materialization of artifacts while session is still open
-            # Access all attributes we'll need later
-            artifacts = list(project.artifacts)
-            # Access basic project attributes to ensure they're loaded
-            _ = project.id, project.user_idea, project.status, project.created_at, project.updated_at
-        
-        return project
-    finally:
-        if should_close:
-            db.close()
+    with session_scope(db) as db:
+        stmt = _SELECT_PROJECT_WITH_ARTIFACTS if eager else _SELECT_PROJECT
+        return db.scalars(stmt, {"project_id": project_id}).unique().first()
 
 
-def get_all_projects(db: Optional[Session] = None, limit: int = 100) -> List[Project]:
+def get_all_projects(
+    db: Optional[Session] = None,
+    limit: int = 100,
+    status: Optional[ProjectStatus] = None
+) -> List[Project]:
     """
     Get all projects ordered by creation date (newest first)
     Artifacts are eagerly loaded to avoid DetachedInstanceError
@@ -244,65 +375,107 @@ def get_all_projects(db: Optional[Session] = None, limit: int = 100) -> List[Pro
     Args:
         db: Optional database session
         limit: Maximum number of projects to return
+        status: Optional status filter, applied in the query
         
     Returns:
         List of Project instances
     """
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
-        # Eagerly load artifacts using selectinload
-        projects = db.query(Project).options(selectinload(Project.artifacts)).order_by(Project.created_at.desc()).limit(limit).all()
-        
-        # Force materialization of artifacts for each project while session is open
-        for project in projects:
-            _ = list(project.artifacts)
+    with session_scope(db) as db:
+        # Eagerly load artifacts using selectinload; any other relationship access raises
+        stmt = select(Project).options(selectinload(Project.artifacts), raiseload("*"))
+        if status is not None:
+            stmt = stmt.where(Project.status == status)
+        stmt = stmt.order_by(Project.created_at.desc()).limit(limit)
         
-        return projects
-    finally:
-        if should_close:
-            db.close()
+        return list(db.scalars(stmt).all())
 
 
 def save_project_artifacts(
     project_id: int,
     artifacts: Dict[str, str],
     output_dir: str = "output",
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    contents: Optional[Dict[str, bytes]] = None
 ) -> List[Artifact]:
     """
     Save all artifacts from a completed pipeline run
     
+    All rows are inserted with a single INSERT ... RETURNING statement and
+    committed in one transaction, together with any pending (flushed but
+    uncommitted) changes on the session.
+    
     Args:
         project_id: Project ID
         artifacts: Dictionary mapping artifact types to file paths (can be absolute or relative)
         output_dir: Base output directory (used for reference, paths in artifacts should already be correct)
         db: Optional database session
+        contents: Optional mapping of artifact types to raw content, stored compressed
         
     Returns:
         List of created Artifact instances
     """
-    created_artifacts = []
-    should_close = False
-    if db is None:
-        db = get_db()
-        should_close = True
-    
-    try:
+    with session_scope(db) as db:
+        rows = []
         for artifact_type, file_path in artifacts.items():
             # Store the path as-is (already includes output_dir from save_output)
             # Convert to absolute path for consistency
             if not os.path.isabs(file_path):
                 file_path = os.path.abspath(file_path)
             
-            artifact = add_artifact(project_id, artifact_type, file_path, db)
-            created_artifacts.append(artifact)
+            content = (contents or {}).get(artifact_type)
+            rows.append({
+                "project_id": project_id,
+                "artifact_type": artifact_type,
+                "file_path": file_path,
+                "content": zlib.compress(content) if content is not None else None
+            })
         
+        if not rows:
+            db.commit()
+            return []
+        
+        # One multi-row INSERT ... RETURNING and a single commit
+        result = db.execute(insert(Artifact).returning(Artifact), rows)
+        created_artifacts = list(result.scalars())
+        db.commit()
         return created_artifacts
-    finally:
-        if should_close:
-            db.close()
 
+
+def get_artifact_contents(project_id: int, db: Optional[Session] = None) -> Dict[int, bytes]:
+    """
+    Get the stored content of a project's artifacts in one query
+    
+    Args:
+        project_id: Project ID
+        db: Optional database session
+        
+    Returns:
+        Dictionary mapping artifact IDs to decompressed content
+        (artifacts without stored content are omitted)
+    """
+    with session_scope(db) as db:
+        rows = db.execute(
+            select(Artifact.id, Artifact.content).where(
+                Artifact.project_id == project_id,
+                Artifact.content.isnot(None)
+            )
+        )
+        return {artifact_id: zlib.decompress(content) for artifact_id, content in rows}
+
+
+def get_compressed_artifact_content(artifact_id: int, db: Optional[Session] = None) -> Optional[bytes]:
+    """
+    Get the stored content of a single artifact, still zlib-compressed
+    
+    Lets callers decompress incrementally instead of holding the whole
+    body in memory.
+    
+    Args:
+        artifact_id: Artifact ID
+        db: Optional database session
+        
+    Returns:
+        Compressed content or None if the artifact has no stored content
+    """
+    with session_scope(db) as db:
+        return db.execute(_SELECT_ARTIFACT_CONTENT, {"artifact_id": artifact_id}).scalar()
@@ -3,6 +3,7 @@ LangGraph Construction - The Genesis Pipeline Workflow
 Orchestrates the 6 agents with parallel execution and synchronization
 """
 
+import functools
 from langgraph.graph import StateGraph, END
 from src.state import GenesisState
 from src.nodes import (
@@ -16,13 +17,15 @@ from src.nodes import (
 from src.logger_config import logger
 
 
+@functools.lru_cache(maxsize=1)
 def create_genesis_graph():
     """
     Constructs the LangGraph workflow for the Genesis Pipeline.
+    Compiled once per process; repeated calls return the same graph.
     
     Graph Structure:
-    START -> Product Owner -> [Creative Director || Solutions Architect] 
-    -> Lead Developer -> Growth Hacker -> Onboarding Specialist -> END
+    START -> Product Owner -> [Creative Director || Solutions Architect]
+    -> [Lead Developer -> Onboarding Specialist || Growth Hacker] -> END
     
     Returns:
         Compiled StateGraph ready for execution
@@ -48,18 +51,19 @@ def create_genesis_graph():
     workflow.add_edge("product_owner", "creative_director")
     workflow.add_edge("product_owner", "solutions_architect")
     
-    # Both parallel agents feed into Lead Developer
-    # LangGraph automatically waits for both to complete
-    workflow.add_edge("creative_director", "lead_developer")
-    workflow.add_edge("solutions_architect", "lead_developer")
+    # Both parallel agents are async, so under ainvoke their LLM calls overlap.
+    # Lead Developer joins on both branches and runs once both have finished
+    workflow.add_edge(["creative_director", "solutions_architect"], "lead_developer")
     
-    # Lead Developer feeds into Growth Hacker
-    workflow.add_edge("lead_developer", "growth_hacker")
+    # Growth Hacker only needs the PRD and brand identity, so it runs
+    # alongside Lead Developer instead of waiting for the source code
+    workflow.add_edge("creative_director", "growth_hacker")
     
-    # Growth Hacker feeds into Onboarding Specialist
-    workflow.add_edge("growth_hacker", "onboarding_specialist")
+    # Lead Developer feeds into Onboarding Specialist
+    workflow.add_edge("lead_developer", "onboarding_specialist")
     
-    # Onboarding Specialist is the terminal node
+    # Growth Hacker and Onboarding Specialist are the terminal nodes
+    workflow.add_edge("growth_hacker", END)
     workflow.add_edge("onboarding_specialist", END)
     
     # Compile the graph
@@ -70,5 +74,14 @@ def create_genesis_graph():
     return app
 
 
-# Export the compiled graph
-genesis_pipeline = create_genesis_graph()
\ No newline at end of file
+def get_genesis_pipeline():
+    """
+    Get the compiled Genesis Pipeline graph
+    
+    The graph is compiled on first use rather than at import, so modules
+    that import this one without running the pipeline skip the compile.
+    
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    return create_genesis_graph()
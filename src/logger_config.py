@@ -3,13 +3,26 @@ Structured JSON Logging Configuration for Observability
 Outputs logs compatible with Grafana Loki
 """
 
+import atexit
 import logging
+import queue
 import sys
-import json
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 from pythonjsonlogger import jsonlogger
 
 
+def _orjson_dumps(obj, default=None, **kwargs) -> str:
+    """
+    JSON serializer for the log formatter backed by orjson
+    
+    Accepts (and ignores) the stdlib json.dumps keyword arguments the
+    formatter passes; unsupported values fall back to str().
+    """
+    return orjson.dumps(obj, default=default or str).decode()
+
+
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """
     Custom JSON formatter that adds service metadata
@@ -19,27 +32,46 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
     def add_fields(self, log_record, record, message_dict):
         super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
         
-        # Add standard fields
-        log_record['timestamp'] = datetime.utcnow().isoformat()
+        # Add standard fields (timestamp derived from the record's creation time, RFC3339 UTC)
+        log_record['timestamp'] = (
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z"
+        )
         log_record['level'] = record.levelname
         log_record['service'] = 'genesis_pipeline'
         log_record['logger'] = record.name
         
-        # Add custom fields if they exist
-        if hasattr(record, 'agent'):
-            log_record['agent'] = record.agent
-        if hasattr(record, 'execution_time'):
-            log_record['execution_time'] = record.execution_time
-        if hasattr(record, 'tokens_used'):
-            log_record['tokens_used'] = record.tokens_used
-        if hasattr(record, 'status'):
-            log_record['status'] = record.status
+        # Custom fields passed via `extra` (agent, execution_time, tokens_used,
+        # status, ...) are already merged by the base class
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for an in-process listener
+    
+    The default prepare() pre-formats the message and drops exc_info so
+    records can be pickled; records here never leave the process, so only
+    the message is interpolated up front (mutable args may change before the
+    listener runs) while exc_info and extra fields reach the JSON formatter.
+    """
+    
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background listener draining the log queue, one per configured logger
+_listeners = {}
 
 
 def setup_logger(name: str = "genesis") -> logging.Logger:
     """
     Configure and return a structured JSON logger
     
+    Records are put on a queue and written to stdout by a background
+    listener thread, so a slow log consumer does not block the caller.
+    
     Args:
         name: Logger name
         
@@ -51,17 +83,28 @@ def setup_logger(name: str = "genesis") -> logging.Logger:
     
     # Remove existing handlers
     logger.handlers = []
+    if name in _listeners:
+        previous_listener = _listeners.pop(name)
+        atexit.unregister(previous_listener.stop)
+        previous_listener.stop()
     
     # Console handler with JSON formatting
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     
     formatter = CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(service)s %(logger)s %(message)s'
+        '%(timestamp)s %(level)s %(service)s %(logger)s %(message)s',
+        json_serializer=_orjson_dumps
     )
     console_handler.setFormatter(formatter)
     
-    logger.addHandler(console_handler)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    atexit.register(listener.stop)
+    
+    logger.addHandler(LocalQueueHandler(log_queue))
     
     return logger
 
@@ -87,6 +130,9 @@ def log_agent_execution(
         status: 'success', 'error', or 'running'
         message: Optional additional message
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     logger.info(
         message or f"Agent {agent_name} execution completed",
         extra={
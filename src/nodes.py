@@ -3,44 +3,38 @@ Agent Node Implementations
 Each function represents an AI agent in the Genesis Pipeline
 """
 
+import asyncio
+import functools
+import logging
 import time
-import json
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
-
-from src.state import GenesisState
+from collections import OrderedDict
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional, Type
+import orjson
+import tiktoken
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, message_chunk_to_message
+from pydantic import BaseModel
+
+from src.state import GenesisState, BrandAssets, ArchitectureMap, SourceCodeFiles
 from src.logger_config import logger, log_agent_execution
 
 
-# Initialize the LLM (lazy initialization to avoid env issues at import)
-def get_llm():
-    """Get or create ChatOpenAI instance"""
-    return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        timeout=120
-    )
+LLM_MODEL = "gpt-4o-mini"
 
+# Shared read-only fallback for missing usage metadata
+_EMPTY = MappingProxyType({})
 
-async def agent_product_owner(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 1: Product Owner
-    Transforms user idea into a comprehensive Product Requirements Document (PRD)
-    
-    Outputs: prd_content
-    """
-    start_time = time.time()
-    agent_name = "product_owner"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        # System prompt for PRD generation
-        system_prompt = """You are a Senior Product Owner with 15 years of experience at top tech companies.
+# Token budgets for the PRD excerpt passed to downstream agents
+PRD_SUMMARY_TOKENS = 400
+PRD_EXCERPT_TOKENS = 600
+# Rough English average, used when the tokenizer cannot be loaded
+CHARS_PER_TOKEN = 4
+
+
+# System prompts are static and always sent as the first message, so every
+# run shares an identical prefix that the provider's prompt cache can reuse
+PRODUCT_OWNER_SYSTEM_PROMPT = """You are a Senior Product Owner with 15 years of experience at top tech companies.
           Your task is to transform a raw user idea into a comprehensive Product Requirements Document (PRD).
 
           The PRD must include:
@@ -55,50 +49,7 @@ async def agent_product_owner(state: GenesisState) -> Dict[str, Any]:
 
           Be specific, actionable, and realistic. Format the output in clear markdown."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"User Idea: {state['user_idea']}")
-        ]
-        
-        # Invoke LLM
-        response = await llm.ainvoke(messages)
-        prd_content = response.content
-        
-        # Calculate metrics
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
-        
-        # Log execution
-        log_agent_execution(agent_name, execution_time, tokens_used, 'success')
-        
-        return {
-            "prd_content": prd_content,
-            "messages": state["messages"] + [response]
-        }
-        
-    except Exception as e:
-        execution_time = time.time() - start_time
-        log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
-
-
-async def agent_creative_director(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 2: Creative Director (Parallel Branch A)
-    Creates brand identity including color schemes, typography, and visual prompts
-    
-    Outputs: brand_assets (JSON structure)
-    """
-    start_time = time.time()
-    agent_name = "creative_director"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        system_prompt = """You are a Creative Director specializing in brand identity and visual design.
+CREATIVE_DIRECTOR_SYSTEM_PROMPT = """You are a Creative Director specializing in brand identity and visual design.
           Based on the user's idea and PRD, create a comprehensive brand guide.
 
           Return your response as a JSON object with this structure:
@@ -123,52 +74,7 @@ async def agent_creative_director(state: GenesisState) -> Dict[str, Any]:
 
           Be creative but align with the product's purpose and target audience."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"User Idea: {state['user_idea']}\n\nPRD Summary: {state['prd_content'][:500]}...")
-        ]
-        
-        # Use structured output for JSON
-        llm_json = llm.bind(response_format={"type": "json_object"})
-        response = await llm_json.ainvoke(messages)
-        
-        # Parse JSON
-        content = response.content if isinstance(response.content, str) else str(response.content)
-        brand_assets = json.loads(content)
-        
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
-        
-        log_agent_execution(agent_name, execution_time, tokens_used, 'success')
-        
-        return {
-            "brand_assets": brand_assets,
-            "messages": state["messages"] + [response]
-        }
-        
-    except Exception as e:
-        execution_time = time.time() - start_time
-        log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
-
-
-async def agent_solutions_architect(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 3: Solutions Architect (Parallel Branch B)
-    Designs the technical architecture and file structure
-    
-    Outputs: architecture_map (JSON structure)
-    """
-    start_time = time.time()
-    agent_name = "solutions_architect"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        system_prompt = """You are a Solutions Architect with expertise in modern software design patterns.
+SOLUTIONS_ARCHITECT_SYSTEM_PROMPT = """You are a Solutions Architect with expertise in modern software design patterns.
           Based on the PRD, design a complete technical architecture and file structure.
 
           Return your response as a JSON object with this structure:
@@ -209,60 +115,18 @@ async def agent_solutions_architect(state: GenesisState) -> Dict[str, Any]:
 
           Be practical and choose technologies appropriate for the project scale."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"User Idea: {state['user_idea']}\n\nPRD: {state['prd_content'][:800]}...")
-        ]
-        
-        llm_json = llm.bind(response_format={"type": "json_object"})
-        response = await llm_json.ainvoke(messages)
-        
-        content = response.content if isinstance(response.content, str) else str(response.content)
-        architecture_map = json.loads(content)
-        
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
-        
-        log_agent_execution(agent_name, execution_time, tokens_used, 'success')
-        
-        return {
-            "architecture_map": architecture_map,
-            "messages": state["messages"] + [response]
-        }
-        
-    except Exception as e:
-        execution_time = time.time() - start_time
-        log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
-
-
-async def agent_lead_developer(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 4: Lead Developer (Synchronization Point)
-    Generates actual source code based on architecture and brand assets
-    
-    Inputs: architecture_map, brand_assets
-    Outputs: source_code (dict of filename -> code)
-    """
-    start_time = time.time()
-    agent_name = "lead_developer"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        system_prompt = """You are a Lead Developer capable of writing production-quality code.
+LEAD_DEVELOPER_SYSTEM_PROMPT = """You are a Lead Developer capable of writing production-quality code.
           Based on the architecture plan and brand assets, generate the core source code files.
 
-          Return your response as a JSON object where keys are file paths and values are code content:
+          Return your response as a JSON object with a single "files" key, mapping file paths to code content:
           {
-            "src/App.jsx": "import React...",
-            "src/components/Header.jsx": "const Header = () => {...}",
-            "src/styles/theme.js": "export const theme = {...}",
-            "backend/server.js": "const express = require('express')...",
-            "README.md": "# Project Name\\n\\n## Setup..."
+            "files": {
+              "src/App.jsx": "import React...",
+              "src/components/Header.jsx": "const Header = () => {...}",
+              "src/styles/theme.js": "export const theme = {...}",
+              "backend/server.js": "const express = require('express')...",
+              "README.md": "# Project Name\\n\\n## Setup..."
+            }
           }
 
           Generate at least 5-8 key files including:
@@ -279,61 +143,8 @@ async def agent_lead_developer(state: GenesisState) -> Dict[str, Any]:
           - Follow best practices
           - Use the brand colors from brand_assets"""
 
-        # Prepare context
-        context = f"""User Idea: {state['user_idea']}
-
-          Architecture:
-          {json.dumps(state['architecture_map'], indent=2)}
-
-          Brand Assets:
-          {json.dumps(state['brand_assets'], indent=2)}"""
-
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=context)
-        ]
-        
-        llm_json = llm.bind(response_format={"type": "json_object"})
-        response = await llm_json.ainvoke(messages)
-        
-        content = response.content if isinstance(response.content, str) else str(response.content)
-        source_code = json.loads(content)
-        
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
-        
-        log_agent_execution(agent_name, execution_time, tokens_used, 'success')
-        
-        return {
-            "source_code": source_code,
-            "messages": state["messages"] + [response]
-        }
-        
-    except Exception as e:
-        execution_time = time.time() - start_time
-        log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
-
-
-async def agent_growth_hacker(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 5: Growth Hacker (Final Node)
-    Creates comprehensive marketing and go-to-market strategy
-    
-    Inputs: prd_content, brand_assets, source_code
-    Outputs: marketing_plan
-    """
-    start_time = time.time()
-    agent_name = "growth_hacker"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        system_prompt = """You are a Growth Hacker with expertise in viral marketing and user acquisition.
-          Based on the complete project (PRD, brand, and code), create a comprehensive Go-To-Market strategy.
+GROWTH_HACKER_SYSTEM_PROMPT = """You are a Growth Hacker with expertise in viral marketing and user acquisition.
+          Based on the product (PRD and brand), create a comprehensive Go-To-Market strategy.
 
           Include:
           1. Target Audience Segmentation
@@ -354,59 +165,7 @@ async def agent_growth_hacker(state: GenesisState) -> Dict[str, Any]:
 
           Be specific with tactics, timelines, and expected outcomes."""
 
-        context = f"""User Idea: {state['user_idea']}
-
-        Product Overview:
-        {state['prd_content'][:500]}...
-
-        Brand Identity:
-        Brand Name: {state['brand_assets'].get('brand_name', 'N/A')}
-        Tagline: {state['brand_assets'].get('tagline', 'N/A')}
-
-        Project Files Generated: {len(state['source_code'])} files"""
-
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=context)
-        ]
-        
-        response = await llm.ainvoke(messages)
-        marketing_plan = response.content
-        
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
-        
-        log_agent_execution(agent_name, execution_time, tokens_used, 'success')
-        
-        return {
-            "marketing_plan": marketing_plan,
-            "messages": state["messages"] + [response]
-        }
-        
-    except Exception as e:
-        execution_time = time.time() - start_time
-        log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
-
-
-async def agent_onboarding_specialist(state: GenesisState) -> Dict[str, Any]:
-    """
-    AGENT 6: Onboarding Specialist (Final Node)
-    Generates installation and setup guide for the generated project
-    
-    Inputs: source_code, architecture_map, marketing_plan
-    Outputs: install_guide
-    """
-    start_time = time.time()
-    agent_name = "onboarding_specialist"
-    
-    try:
-        logger.info(f"Starting {agent_name} agent", extra={'agent': agent_name, 'status': 'running'})
-        
-        llm = get_llm()
-        
-        system_prompt = """You are an Onboarding Specialist with expertise in technical documentation and developer experience.
+ONBOARDING_SPECIALIST_SYSTEM_PROMPT = """You are an Onboarding Specialist with expertise in technical documentation and developer experience.
 Based on the generated source code and architecture, create a comprehensive INSTALL_GUIDE.md that explains how to set up and run the generated project.
 
 The guide must be specific to the actual architecture and tech stack chosen by the Solutions Architect. Include:
@@ -443,54 +202,378 @@ The guide must be specific to the actual architecture and tech stack chosen by t
 Be extremely specific with commands, file paths, and configuration. Use the actual tech stack from the architecture_map.
 Do NOT include instructions for running the Genesis Pipeline itself - only for the GENERATED project."""
 
-        # Prepare context with architecture and source code info
-        architecture_summary = json.dumps(state['architecture_map'], indent=2)
-        
-        # Get list of generated files
-        source_files = list(state['source_code'].keys())
-        source_files_summary = "\n".join([f"- {f}" for f in source_files[:20]])  # Show first 20 files
-        
-        # Get tech stack info
-        tech_stack = state['architecture_map'].get('tech_stack', {})
-        tech_stack_summary = json.dumps(tech_stack, indent=2)
-        
-        context = f"""User Idea: {state['user_idea']}
 
-Architecture & Tech Stack:
-{tech_stack_summary}
+# Initialize the LLM (lazy initialization to avoid env issues at import)
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """
+    Get the shared ChatOpenAI instance
+    
+    Created on first use and reused by every agent. Its HTTP/2 client keeps
+    connections alive across agent calls and multiplexes the requests of
+    agents running in parallel over them.
+    """
+    # Imported here: langchain_openai is slow to import and only needed once a run starts
+    import httpx
+    from langchain_openai import ChatOpenAI
+    
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=120
+    )
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        temperature=0.7,
+        timeout=120,
+        stream_usage=True,
+        http_async_client=http_client
+    )
 
-Full Architecture Map:
-{architecture_summary}
 
-Generated Source Files ({len(state['source_code'])} total):
-{source_files_summary}
-{"... (and more)" if len(source_files) > 20 else ""}
+@functools.lru_cache(maxsize=None)
+def get_structured_llm(schema):
+    """
+    Get the shared LLM bound to return `schema` through tool calling
+    
+    The runnable returns a dict with the raw message ("raw"), the
+    validated model ("parsed") and any "parsing_error".
+    """
+    return get_llm().with_structured_output(schema, include_raw=True)
 
-Key Files to Note:
-- Look for package.json, requirements.txt, Dockerfile, or similar dependency files
-- Check for README files or configuration examples
-- Identify entry points (main.js, app.py, index.jsx, etc.)"""
 
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    Get the model's tokenizer, or None if it cannot be loaded
+    
+    tiktoken downloads the BPE file on first use (blocking), so this is only
+    called off the event loop. A failure is cached too, so an offline host
+    does not retry the download on every call.
+    """
+    try:
+        return tiktoken.encoding_for_model(LLM_MODEL)
+    except Exception as e:
+        logger.warning("Tokenizer unavailable, truncating by characters: %s", e)
+        return None
+
+
+def _truncate_tokens_sync(text: str, max_tokens: int) -> str:
+    """Blocking implementation of truncate_tokens()"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+async def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most `max_tokens` model tokens
+    
+    Runs in a worker thread so loading the tokenizer and encoding long text
+    never stall other agents. Falls back to CHARS_PER_TOKEN characters per
+    token when the tokenizer is unavailable.
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        
+    Returns:
+        The text unchanged if it fits, otherwise its longest prefix within the budget
+    """
+    return await asyncio.to_thread(_truncate_tokens_sync, text, max_tokens)
+
+
+@functools.lru_cache(maxsize=None)
+def _system_message(prompt: str) -> SystemMessage:
+    """Build the message for a static system prompt once and reuse it"""
+    return SystemMessage(content=prompt)
+
+
+async def _stream_response(llm, messages) -> AIMessage:
+    """
+    Stream a completion and return it as a single message
+    
+    Tokens reach LangGraph stream/event consumers as they arrive instead of
+    after the whole document is generated. Token usage is reported on the
+    final chunk (stream_usage=True) and ends up in usage_metadata.
+    """
+    chunks = [chunk async for chunk in llm.astream(messages)]
+    if not chunks:
+        raise ValueError("LLM stream ended without returning any content")
+    
+    # Merge once at the end; adding chunk by chunk re-copies the content every token
+    return message_chunk_to_message(chunks[0] + chunks[1:])
+
+
+async def _run_agent(
+    agent_name: str,
+    system_prompt: str,
+    human_content: str,
+    output_key: str,
+    schema: Optional[Type[BaseModel]] = None,
+    parse: Callable[[BaseModel], Any] = BaseModel.model_dump,
+    stream: bool = False
+) -> Dict[str, Any]:
+    """
+    Run one agent's LLM call with shared logging, timing and token accounting
+    
+    Args:
+        agent_name: Agent name used in logs
+        system_prompt: Static system prompt, sent first
+        human_content: Run-specific context
+        output_key: State key the agent's output is written to
+        schema: Optional Pydantic model for structured output
+        parse: Converts the validated model to the state value (schema only)
+        stream: Stream a plain-text response instead of a single call
+        
+    Returns:
+        State update with the agent's output and its response message
+    """
+    start_ns = time.perf_counter_ns()
+    
+    try:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting %s agent", agent_name, extra={'agent': agent_name, 'status': 'running'})
+        
         messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=context)
+            _system_message(system_prompt),
+            HumanMessage(content=human_content)
         ]
         
-        response = await llm.ainvoke(messages)
-        install_guide = response.content
+        if schema is not None:
+            result = await get_structured_llm(schema).ainvoke(messages)
+            if result["parsing_error"] is not None:
+                raise result["parsing_error"]
+            response = result["raw"]
+            output = parse(result["parsed"])
+        elif stream:
+            response = await _stream_response(get_llm(), messages)
+            output = response.content
+        else:
+            response = await get_llm().ainvoke(messages)
+            output = response.content
         
-        execution_time = time.time() - start_time
-        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
+        # Calculate metrics
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
+        tokens_used = (response.usage_metadata or _EMPTY).get('total_tokens', 0)
         
+        # Log execution
         log_agent_execution(agent_name, execution_time, tokens_used, 'success')
         
         return {
-            "install_guide": install_guide,
-            "messages": state["messages"] + [response]
+            output_key: output,
+            "messages": [response]
         }
         
     except Exception as e:
-        execution_time = time.time() - start_time
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
         log_agent_execution(agent_name, execution_time, 0, 'error', str(e))
-        logger.error(f"Error in {agent_name}: {str(e)}", extra={'agent': agent_name})
-        raise
\ No newline at end of file
+        logger.error("Error in %s: %s", agent_name, e, extra={'agent': agent_name})
+        raise
+
+
+def cache_agent_output(agent_name: str, output_key: str, maxsize: int = 128):
+    """
+    Reuse an agent's output when the same user idea comes in again
+    
+    Ideas are matched after case-folding and collapsing whitespace, so
+    retries and repeated demo inputs skip the LLM call. Entries are kept
+    per process, least recently used first out. Concurrent runs with the
+    same idea are coalesced: while one call is in flight, the others await
+    its result instead of issuing their own.
+    
+    Args:
+        agent_name: Agent name used in logs
+        output_key: State key holding the agent's output
+        maxsize: Maximum number of cached ideas
+    """
+    def decorator(agent):
+        cache: "OrderedDict[str, Any]" = OrderedDict()
+        in_flight: Dict[str, asyncio.Task] = {}
+        
+        @functools.wraps(agent)
+        async def wrapper(state: GenesisState) -> Dict[str, Any]:
+            key = " ".join(state['user_idea'].casefold().split())
+            if key in cache:
+                cache.move_to_end(key)
+                log_agent_execution(agent_name, 0.0, 0, 'success', f"Agent {agent_name} served from cache")
+                return {output_key: cache[key]}
+            
+            if key in in_flight:
+                update = await asyncio.shield(in_flight[key])
+                log_agent_execution(agent_name, 0.0, 0, 'success', f"Agent {agent_name} joined an in-flight call")
+                return {output_key: update[output_key]}
+            
+            task = asyncio.ensure_future(agent(state))
+            in_flight[key] = task
+            task.add_done_callback(functools.partial(finish, key))
+            # Shielded for the caller too: the shared call outlives any one
+            # cancelled waiter, and its result is still cached when it completes
+            return await asyncio.shield(task)
+        
+        def finish(key: str, task: asyncio.Task):
+            del in_flight[key]
+            if task.cancelled() or task.exception() is not None:
+                return
+            cache[key] = task.result()[output_key]
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+        
+        return wrapper
+    return decorator
+
+
+@cache_agent_output("product_owner", "prd_content")
+async def agent_product_owner(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 1: Product Owner
+    Transforms user idea into a comprehensive Product Requirements Document (PRD)
+    
+    Outputs: prd_content
+    """
+    return await _run_agent(
+        "product_owner",
+        PRODUCT_OWNER_SYSTEM_PROMPT,
+        f"User Idea: {state['user_idea']}",
+        "prd_content",
+        stream=True
+    )
+
+
+async def agent_creative_director(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 2: Creative Director (Parallel Branch A)
+    Creates brand identity including color schemes, typography, and visual prompts
+    
+    Outputs: brand_assets (JSON structure)
+    """
+    prd_summary = await truncate_tokens(state['prd_content'], PRD_SUMMARY_TOKENS)
+    
+    return await _run_agent(
+        "creative_director",
+        CREATIVE_DIRECTOR_SYSTEM_PROMPT,
+        f"User Idea: {state['user_idea']}\n\nPRD Summary: {prd_summary}...",
+        "brand_assets",
+        schema=BrandAssets
+    )
+
+
+async def agent_solutions_architect(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 3: Solutions Architect (Parallel Branch B)
+    Designs the technical architecture and file structure
+    
+    Outputs: architecture_map (JSON structure)
+    """
+    prd_excerpt = await truncate_tokens(state['prd_content'], PRD_EXCERPT_TOKENS)
+    
+    return await _run_agent(
+        "solutions_architect",
+        SOLUTIONS_ARCHITECT_SYSTEM_PROMPT,
+        f"User Idea: {state['user_idea']}\n\nPRD: {prd_excerpt}...",
+        "architecture_map",
+        schema=ArchitectureMap
+    )
+
+
+async def agent_lead_developer(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 4: Lead Developer (Synchronization Point)
+    Generates actual source code based on architecture and brand assets
+    
+    Inputs: architecture_map, brand_assets
+    Outputs: source_code (dict of filename -> code)
+    """
+    # Prepare context (orjson serializes straight to UTF-8 bytes)
+    context = "".join((
+        f"User Idea: {state['user_idea']}\n\nArchitecture:\n",
+        orjson.dumps(state['architecture_map'], option=orjson.OPT_INDENT_2).decode(),
+        "\n\nBrand Assets:\n",
+        orjson.dumps(state['brand_assets'], option=orjson.OPT_INDENT_2).decode()
+    ))
+    
+    return await _run_agent(
+        "lead_developer",
+        LEAD_DEVELOPER_SYSTEM_PROMPT,
+        context,
+        "source_code",
+        schema=SourceCodeFiles,
+        parse=lambda parsed: parsed.files
+    )
+
+
+async def agent_growth_hacker(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 5: Growth Hacker (Final Node, parallel with Lead Developer)
+    Creates comprehensive marketing and go-to-market strategy
+    
+    Inputs: prd_content, brand_assets
+    Outputs: marketing_plan
+    """
+    prd_summary = await truncate_tokens(state['prd_content'], PRD_SUMMARY_TOKENS)
+    
+    context = f"""User Idea: {state['user_idea']}
+
+        Product Overview:
+        {prd_summary}...
+
+        Brand Identity:
+        Brand Name: {state['brand_assets'].get('brand_name', 'N/A')}
+        Tagline: {state['brand_assets'].get('tagline', 'N/A')}"""
+    
+    return await _run_agent(
+        "growth_hacker",
+        GROWTH_HACKER_SYSTEM_PROMPT,
+        context,
+        "marketing_plan",
+        stream=True
+    )
+
+
+async def agent_onboarding_specialist(state: GenesisState) -> Dict[str, Any]:
+    """
+    AGENT 6: Onboarding Specialist (Final Node)
+    Generates installation and setup guide for the generated project
+    
+    Inputs: source_code, architecture_map
+    Outputs: install_guide
+    """
+    # Prepare context with architecture and source code info
+    architecture_summary = orjson.dumps(state['architecture_map'], option=orjson.OPT_INDENT_2).decode()
+    
+    # Get list of generated files (only the first 20 are walked)
+    source_file_count = len(state['source_code'])
+    source_files_summary = "\n".join(f"- {f}" for f in islice(state['source_code'], 20))
+    
+    # Get tech stack info
+    tech_stack = state['architecture_map'].get('tech_stack', {})
+    tech_stack_summary = orjson.dumps(tech_stack, option=orjson.OPT_INDENT_2).decode()
+    
+    context = f"""User Idea: {state['user_idea']}
+
+Architecture & Tech Stack:
+{tech_stack_summary}
+
+Full Architecture Map:
+{architecture_summary}
+
+Generated Source Files ({source_file_count} total):
+{source_files_summary}
+{"... (and more)" if source_file_count > 20 else ""}
+
+Key Files to Note:
+- Look for package.json, requirements.txt, Dockerfile, or similar dependency files
+- Check for README files or configuration examples
+- Identify entry points (main.js, app.py, index.jsx, etc.)"""
+    
+    return await _run_agent(
+        "onboarding_specialist",
+        ONBOARDING_SPECIALIST_SYSTEM_PROMPT,
+        context,
+        "install_guide"
+    )
@@ -3,9 +3,10 @@ State Definition for Genesis Pipeline
 Manages the shared state between all AI agents
 """
 
-from typing import TypedDict, Annotated, Sequence, Dict, Any
+from typing import TypedDict, Annotated, Sequence, Dict, Any, List
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
+from pydantic import BaseModel, Field
 
 
 class GenesisState(TypedDict):
@@ -31,6 +32,74 @@ class GenesisState(TypedDict):
     execution_metadata: Dict[str, Any]  # Tracks timing, tokens, errors
 
 
+# Structured outputs of the JSON agents. The LLM fills these through tool
+# calling, so responses are schema-checked; nodes store them in the state
+# as plain dicts via model_dump().
+
+class ColorPalette(BaseModel):
+    """Brand colors as hex codes"""
+    primary: str
+    secondary: str
+    accent: str
+    background: str
+    text: str
+
+
+class Typography(BaseModel):
+    """Brand font choices"""
+    heading_font: str
+    body_font: str
+
+
+class BrandAssets(BaseModel):
+    """Brand identity guide for the product (Creative Director)"""
+    brand_name: str
+    tagline: str
+    color_palette: ColorPalette
+    typography: Typography
+    visual_style: str
+    logo_prompt: str
+    ui_mockup_prompts: List[str]
+
+
+class TechStack(BaseModel):
+    """Technologies chosen for each layer"""
+    frontend: List[str]
+    backend: List[str]
+    database: str
+    infrastructure: List[str]
+
+
+class KeyModule(BaseModel):
+    """A functional module and the files that implement it"""
+    name: str
+    files: List[str]
+    dependencies: List[str]
+
+
+class ApiEndpoint(BaseModel):
+    """A single HTTP endpoint"""
+    method: str
+    path: str
+    description: str
+
+
+class ArchitectureMap(BaseModel):
+    """Technical architecture and file structure (Solutions Architect)"""
+    tech_stack: TechStack
+    architecture_pattern: str
+    file_structure: Dict[str, Any] = Field(
+        description="Nested directory tree; directories map to sub-trees or lists of file names"
+    )
+    key_modules: List[KeyModule]
+    api_endpoints: List[ApiEndpoint]
+
+
+class SourceCodeFiles(BaseModel):
+    """Generated source code files for the project (Lead Developer)"""
+    files: Dict[str, str] = Field(description="File path -> complete file content")
+
+
 def create_initial_state(user_idea: str) -> GenesisState:
     """
     Factory function to create a clean initial state.
@@ -41,6 +110,7 @@ def create_initial_state(user_idea: str) -> GenesisState:
     Returns:
         GenesisState with initialized values
     """
+    # A fresh literal per call, so no run can share a mutable container
     return GenesisState(
         user_idea=user_idea,
         prd_content="",
@@ -51,9 +121,9 @@ def create_initial_state(user_idea: str) -> GenesisState:
         install_guide="",
         messages=[],
         execution_metadata={
-            "start_time": None,
-            "end_time": None,
+            "start_time_ns": None,  # Wall-clock epoch ns, for display
+            "duration_ms": None,  # Measured with a monotonic clock
             "total_tokens": 0,
             "agent_timings": {}
         }
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,60 @@
+"""
+Tests for the database helpers, run against a temporary SQLite database
+"""
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from src import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the module at a fresh SQLite database and yield a session"""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'genesis.db'}")
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    database.get_database_url.cache_clear()
+    
+    database.init_database()
+    session = database.get_db()
+    yield session
+    
+    session.close()
+    database._engine.dispose()
+    database.get_database_url.cache_clear()
+
+
+def test_get_project_raises_on_unloaded_relationship(db):
+    project = database.create_project("An idea worth testing", db)
+    db.expunge_all()
+    
+    loaded = database.get_project(project.id, db)
+    
+    assert loaded.user_idea == "An idea worth testing"
+    with pytest.raises(InvalidRequestError):
+        loaded.artifacts
+
+
+def test_get_project_eager_loads_artifacts(db):
+    project = database.create_project("An idea worth testing", db)
+    database.add_artifact(project.id, "prd", "/tmp/PRD.md", db)
+    db.expunge_all()
+    
+    loaded = database.get_project(project.id, db, eager=True)
+    
+    assert [artifact.artifact_type for artifact in loaded.artifacts] == ["prd"]
+    with pytest.raises(InvalidRequestError):
+        loaded.artifacts[0].project
+
+
+def test_get_all_projects_raises_on_unloaded_relationship(db):
+    project = database.create_project("An idea worth testing", db)
+    database.add_artifact(project.id, "prd", "/tmp/PRD.md", db)
+    db.expunge_all()
+    
+    projects = database.get_all_projects(db)
+    
+    assert [artifact.artifact_type for artifact in projects[0].artifacts] == ["prd"]
+    with pytest.raises(InvalidRequestError):
+        projects[0].artifacts[0].project